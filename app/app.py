@@ -1,7 +1,12 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-import re
+import asyncio
+
+try:
+    from .sql_scan import scan_selects  # uvicorn app.app:app from the repo root
+except ImportError:
+    from sql_scan import scan_selects  # uvicorn app:app from inside app/
 
 app = FastAPI(
     title="ABAP Scanner - ORDER BY / SORT Rule (system MSG exact)",
@@ -33,122 +38,44 @@ class Unit(BaseModel):
     code: Optional[str] = ""
     orderby_sort_findings: Optional[List[Finding]] = None
 
-# ==== Regexes for SQL analysis ====
-SQL_SELECT_BLOCK_RE = re.compile(
-    r"\bSELECT\b(?P<single>\s+SINGLE)?(?P<select>.+?)\bFROM\b\s+(?P<table>\w+)(?P<rest>.*?\.)",
-    re.IGNORECASE | re.DOTALL,
-)
-FOR_ALL_ENTRIES_RE = re.compile(r"\bFOR\s+ALL\s+ENTRIES\b", re.IGNORECASE)
-FIELDS_RE = re.compile(r"\b(\w+)\b", re.IGNORECASE)
-ORDERBY_RE = re.compile(r"ORDER\s+BY", re.IGNORECASE)
-INTO_TABLE_RE = re.compile(r"\bINTO\s+TABLE\s+(?:@DATA\((\w+)\)|(\w+))", re.IGNORECASE)
-
-def make_sort_re(table_name: str):
-    return re.compile(rf"\bSORT\s+{re.escape(table_name)}\b.*?\bBY\b", re.IGNORECASE | re.DOTALL)
-
 # ==== System snippet helper (identical method as system message) ====
+NEWLINE_ESCAPES = str.maketrans({"\n": "\\n", "\r": "\\r"})
+
 def snippet_at(text: str, start: int, end: int) -> str:
     s = max(0, start - 60)
     e = min(len(text), end + 60)
-    return text[s:e].replace("\n", "\\n")
+    return text[s:e].translate(NEWLINE_ESCAPES)
 
-# ==== Main scanner, system-message identical finding structure ====
+# ==== Main scanner, system-message identical finding structure (plain dicts shaped like Finding) ====
 def scan_sql_block_style(code: str):
     findings = []
-
-    for stmt in SQL_SELECT_BLOCK_RE.finditer(code):
-        stmt_text = stmt.group(0)
-        span = stmt.span()
-        start, end = span
-        is_single = bool(stmt.group("single"))
-        has_fae = FOR_ALL_ENTRIES_RE.search(stmt_text) is not None
-
-        select_fields_raw = stmt.group("select")
-        if is_single:
-            select_fields_raw = re.sub(r'^\s*SINGLE\s+', '', select_fields_raw, flags=re.IGNORECASE)
-        select_fields_raw = re.sub(
-            r"\bINTO\b.+", "", select_fields_raw, flags=re.IGNORECASE | re.DOTALL
-        )
-        select_fields_raw = re.sub(r"\s+", " ", select_fields_raw).strip()
-
-        if "*" in select_fields_raw:
-            findings.append(Finding(
-                target_type="SQL_SELECT",
-                target_name="SELECT_SINGLE" if is_single else ("FOR_ALL_ENTRIES" if has_fae else "NO_FOR_ALL_ENTRIES"),
-                table=None,
-                start_char_in_unit=start,
-                end_char_in_unit=end,
-                used_fields=["*"],
-                ambiguous=False,
-                suggested_fields=None,
-                suggested_statement="Avoid SELECT * — not recommended. Please specify fields explicitly.",
-                snippet=snippet_at(code, start, end),
-                meta=None
-            ))
-            continue
-
-        fields = []
-        for tok in FIELDS_RE.findall(select_fields_raw):
-            tok_up = tok.upper()
-            if tok_up != "DISTINCT":
-                fields.append(tok_up)
-        fields = list(dict.fromkeys(fields))
-
-        target_table = None
-        m = INTO_TABLE_RE.search(stmt_text)
-        if m:
-            target_table = m.group(1) or m.group(2)
-
-        suggestion = None
-        if is_single:
-            suggestion = None
-        elif not has_fae:
-            if not ORDERBY_RE.search(stmt_text.replace("\n", " ")):
-                suggestion = (
-                    f"Add ORDER BY {', '.join(fields)} inside SELECT (all fields in select list)."
-                    if fields else "Add ORDER BY with all select fields."
-                )
-        else:
-            after_stmt_text = code[end:]
-            cleaned_lines = [line for line in after_stmt_text.splitlines() if not line.strip().startswith("*")]
-            after_stmt_text = "\n".join(cleaned_lines)
-
-            found_sort = False
-            if target_table:
-                sort_re = make_sort_re(target_table)
-                if sort_re.search(after_stmt_text):
-                    found_sort = True
-
-            if not found_sort:
-                suggestion = (
-                    f"Add SORT by {', '.join(fields)} after this SELECT into {target_table} (all fields in select list)." if fields
-                    else f"Add SORT by all select fields after this SELECT into {target_table}."
-                )
-
-        if suggestion:
-            findings.append(Finding(
-                target_type="SQL_SELECT",
-                target_name="SELECT_SINGLE" if is_single else ("FOR_ALL_ENTRIES" if has_fae else "NO_FOR_ALL_ENTRIES"),
-                table=target_table,
-                start_char_in_unit=start,
-                end_char_in_unit=end,
-                used_fields=fields,
-                ambiguous=False,
-                suggested_fields=None,
-                suggested_statement=suggestion,
-                snippet=snippet_at(code, start, end),
-                meta=None
-            ))
+    for hit in scan_selects(code):
+        start, end = hit["span"]
+        findings.append({
+            "target_type": hit["target_type"],
+            "target_name": hit["target_name"],
+            "table": hit["table"],
+            "start_char_in_unit": start,
+            "end_char_in_unit": end,
+            "used_fields": hit["used_fields"],
+            "ambiguous": False,
+            "suggested_fields": None,
+            "suggested_statement": hit["suggested_statement"],
+            "snippet": snippet_at(code, start, end),
+            "meta": None
+        })
     return findings
 
 @app.post("/assess-orderby-sort")
 async def assess(units: List[Unit]):
+    # Scan units on worker threads so the event loop is not blocked by regex work
+    findings_per_unit = await asyncio.gather(
+        *(asyncio.to_thread(scan_sql_block_style, u.code or "") for u in units)
+    )
     results = []
-    for u in units:
-        code = u.code or ""
-        findings = scan_sql_block_style(code)
-        obj = u.model_copy()
-        obj.orderby_sort_findings = findings
+    for u, findings in zip(units, findings_per_unit):
+        obj = u.model_dump(exclude={"orderby_sort_findings"})
+        obj["orderby_sort_findings"] = findings
         results.append(obj)
     return results
 
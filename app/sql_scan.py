@@ -0,0 +1,182 @@
+from bisect import bisect_left
+from functools import lru_cache
+import re
+
+# ==== Shared ORDER BY / SORT rule core used by app.py and app1.py ====
+
+# Finding target type / names shared by every finding
+TARGET_TYPE_SQL_SELECT = "SQL_SELECT"
+TARGET_SELECT_SINGLE = "SELECT_SINGLE"
+TARGET_FOR_ALL_ENTRIES = "FOR_ALL_ENTRIES"
+TARGET_NO_FOR_ALL_ENTRIES = "NO_FOR_ALL_ENTRIES"
+
+# Regex: capture SELECT [SINGLE] ... FROM ... until first period (.)
+SQL_SELECT_BLOCK_RE = re.compile(
+    r"\bSELECT\b(?P<single>\s+SINGLE)?(?P<select>[^.]+?)\bFROM\b\s+(?P<table>\w+)(?P<rest>[^.]*\.)",
+    re.IGNORECASE | re.DOTALL,
+)
+FOR_ALL_ENTRIES_RE = re.compile(r"\bFOR\s+ALL\s+ENTRIES\b", re.IGNORECASE)
+ORDERBY_RE = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+INTO_TABLE_RE = re.compile(r"\bINTO\s+TABLE\s+(?:@DATA\((\w+)\)|(\w+))", re.IGNORECASE)
+INTO_KW_RE = re.compile(r"\bINTO\b", re.IGNORECASE)
+FIELDS_RE = re.compile(r"\b(\w+)\b", re.IGNORECASE)
+
+# Line terminators recognised by str.splitlines (lone \r included), as a regex class body
+LINE_BREAKS = r"\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+LINE_BREAK_RE = re.compile(rf"[{LINE_BREAKS}]")
+
+# "*" comment lines, including their leading blanks
+ABAP_COMMENT_LINE_RE = re.compile(rf"(?:(?<=[{LINE_BREAKS}])|\A)[^\S{LINE_BREAKS}]*\*[^{LINE_BREAKS}]*")
+
+# Greedy and used with match(), so they end at the last SORT / BY keyword of the unit
+LAST_SORT_RE = re.compile(r".*\bSORT\b", re.IGNORECASE | re.DOTALL)
+LAST_BY_RE = re.compile(r".*\bBY\b", re.IGNORECASE | re.DOTALL)
+
+@lru_cache(maxsize=512)
+def _compile_sort_re(table_key: str):
+    # Called with the lowercased table name; patterns are case-insensitive, so TAB and tab share one cache slot
+    return re.compile(rf"\bSORT\s+{re.escape(table_key)}\b", re.IGNORECASE)
+
+def blank_comment_lines(code: str) -> str:
+    # Same length as code, so offsets still line up with the original text
+    return ABAP_COMMENT_LINE_RE.sub(lambda m: " " * len(m.group()), code)
+
+def build_sort_index(code: str) -> dict:
+    # Per-unit SORT lookup state: comment lines blanked once, SORT <itab> heads filled per table on use
+    live_code = blank_comment_lines(code)
+    last_by = LAST_BY_RE.match(live_code)
+    return {
+        "code": code,
+        "live_code": live_code,
+        "last_by_start": last_by.end() - 2 if last_by else -1,
+        "sort_heads": {},
+    }
+
+def sort_heads(sort_index: dict, table_name: str):
+    # Start / end offsets of every live SORT <itab> head, cached per lowercased table name
+    key = table_name.lower()
+    heads = sort_index["sort_heads"].get(key)
+    if heads is None:
+        starts, ends = [], []
+        for m in _compile_sort_re(key).finditer(sort_index["live_code"]):
+            starts.append(m.start())
+            ends.append(m.end())
+        heads = sort_index["sort_heads"][key] = (starts, ends)
+    return heads
+
+def has_sort_after(sort_index: dict, table_name: str, pos: int) -> bool:
+    # The rest of the SELECT's own line is skipped when it starts a "*" comment
+    live_code = sort_index["live_code"]
+    line_break = LINE_BREAK_RE.search(live_code, pos)
+    line_end = line_break.start() if line_break else len(live_code)
+    line_rest = sort_index["code"][pos:line_end]
+    if line_rest.lstrip().startswith("*"):
+        pos = line_end
+    elif line_rest != live_code[pos:line_end]:
+        # SELECT inside a comment line: the text after its period still counts as code
+        tail = line_rest + live_code[line_end:]
+        m = _compile_sort_re(table_name.lower()).search(tail)
+        return m is not None and LAST_BY_RE.match(tail, m.end()) is not None
+
+    # The first SORT <itab> at or after pos needs a BY somewhere after it
+    starts, ends = sort_heads(sort_index, table_name)
+    i = bisect_left(starts, pos)
+    return i < len(starts) and ends[i] <= sort_index["last_by_start"]
+
+# One hit dict per SELECT that needs a finding: target_type, target_name, table,
+# span, used_fields, suggested_statement
+def scan_selects(code: str):
+    hits = []
+
+    # Built on the first SORT lookup of the unit
+    sort_index = None
+
+    # A SELECT ending after the last SORT keyword cannot be followed by a SORT;
+    # only looked up once a FOR ALL ENTRIES SELECT with a target table shows up
+    last_sort_pos = None
+
+    for stmt in SQL_SELECT_BLOCK_RE.finditer(code):
+        # Statement clauses are searched in place in code, bounded by the match span
+        span = stmt.span()
+        start, end = span
+        is_single = bool(stmt.group("single"))
+        # FOR ALL ENTRIES can only follow the FROM table
+        has_fae = FOR_ALL_ENTRIES_RE.search(code, stmt.start("rest"), end) is not None
+        target_name = (
+            TARGET_SELECT_SINGLE if is_single else TARGET_FOR_ALL_ENTRIES if has_fae else TARGET_NO_FOR_ALL_ENTRIES
+        )
+
+        # Selected fields end at INTO (old-style SELECT ... INTO ... FROM)
+        select_raw = stmt.group("select")
+        into = INTO_KW_RE.search(select_raw)
+        select_end = into.start() if into else len(select_raw)
+
+        # Case A: SELECT * → Always suggestion
+        if select_raw.find("*", 0, select_end) >= 0:
+            hits.append({
+                "target_type": TARGET_TYPE_SQL_SELECT,
+                "target_name": target_name,
+                "table": None,
+                "span": span,
+                "used_fields": ["*"],
+                "suggested_statement": "Avoid SELECT * — not recommended. Please specify fields explicitly.",
+            })
+            continue
+
+        # Extract list of fields (deduped, order kept)
+        seen_fields = set()
+        fields = []
+        for tok in FIELDS_RE.findall(select_raw, 0, select_end):
+            tok_up = tok.upper()
+            if tok_up == "DISTINCT" or tok_up in seen_fields:
+                continue
+            seen_fields.add(tok_up)
+            fields.append(tok_up)
+
+        # Extract INTO TABLE target name
+        target_table = None
+        m = INTO_TABLE_RE.search(code, start, end)
+        if m:
+            target_table = m.group(1) or m.group(2)
+
+        suggestion = None
+
+        # Skip ORDER BY check for SELECT SINGLE
+        if is_single:
+            pass  # No order by or sort required for select single
+
+        elif not has_fae:  # --- Normal SELECT must have ORDER BY
+            if not ORDERBY_RE.search(code, start, end):
+                if fields:
+                    suggestion = "Add ORDER BY " + ", ".join(fields) + " inside SELECT (all fields in select list)."
+                else:
+                    suggestion = "Add ORDER BY with all select fields."
+        else:  # --- FOR ALL ENTRIES must have SORT for same table
+            found_sort = False
+            if target_table:
+                if last_sort_pos is None:
+                    last_sort = LAST_SORT_RE.match(code)
+                    last_sort_pos = last_sort.end() - 4 if last_sort else -1
+                if last_sort_pos >= end:
+                    # Look for the SORT in the code after the SELECT period, skipping comment lines
+                    if sort_index is None:
+                        sort_index = build_sort_index(code)
+                    found_sort = has_sort_after(sort_index, target_table, end)
+
+            if not found_sort:
+                suggestion = (
+                    f"Add SORT by {', '.join(fields)} after this SELECT into {target_table} (all fields in select list)."
+                    if fields else f"Add SORT by all select fields after this SELECT into {target_table}."
+                )
+
+        if suggestion:
+            hits.append({
+                "target_type": TARGET_TYPE_SQL_SELECT,
+                "target_name": target_name,
+                "table": target_table,
+                "span": span,
+                "used_fields": fields,
+                "suggested_statement": suggestion,
+            })
+
+    return hits